@@ -0,0 +1,176 @@
+# batch.py
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from main import (
+    FEATURE_ENCODING,
+    INPUT_ENGINE,
+    ID_COLUMN,
+    raw_columns,
+    load_models,
+    load_threshold,
+    monitor_inputs,
+    score
+)
+from scripts.ingestion import read_input
+from scripts.output import output_format, write_output
+from scripts.monitoring import DriftMonitor, load_reference, alerts
+
+
+OUTPUT_DIR = "output/batch"
+
+# Loaded once per worker process by init_worker
+worker_models = None
+worker_threshold = None
+worker_reference = None
+
+def init_worker(encoding, threshold, reference):
+    global worker_models, worker_threshold, worker_reference
+    worker_models = load_models(encoding)
+    worker_threshold = threshold
+    worker_reference = reference
+
+def expand_inputs(patterns):
+    # Directories contribute their *.csv files, anything else is treated as a glob
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths += sorted(glob.glob(os.path.join(pattern, "*.csv")))
+        else:
+            paths += sorted(glob.glob(pattern))
+    return list(dict.fromkeys(paths))
+
+def output_names(paths):
+    # Output file stem per input, numbered when two inputs share a file name
+    names, seen = {}, {}
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        seen[stem] = seen.get(stem, 0) + 1
+        names[path] = stem if seen[stem] == 1 else f"{stem}_{seen[stem]}"
+    return names
+
+def score_file(path, name, output_dir, encoding, engine, fmt, include_input, member_probs, chunk_size):
+    start = time.perf_counter()
+    result = {"file": path, "worker": os.getpid(), "rows": 0, "scored_rows": 0, "malformed": 0, "members": "", "alerts": 0, "error": "", "monitor": None}
+
+    try:
+        input_df, malformed = read_input(
+            path,
+            columns=[ID_COLUMN] + [c for features in raw_columns.values() for c in features],
+            engine=engine
+        )
+        result["rows"] = len(input_df)
+        result["malformed"] = malformed["line"].nunique()
+        if not malformed.empty:
+            malformed.to_csv(os.path.join(output_dir, f"{name}_malformed.csv"), index=False)
+
+        predictions, probs, model_to_data = score(input_df, worker_models, worker_threshold, encoding)
+        write_output(
+            os.path.join(output_dir, f"{name}_predictions.{fmt}"),
+            predictions,
+            fmt=fmt,
+            input_df=input_df,
+            member_probs=probs if member_probs else None,
+            id_column=ID_COLUMN,
+            include_input=include_input,
+            input_path=path,
+            skip_lines=malformed["line"],
+            chunk_size=chunk_size
+        )
+
+        result["scored_rows"] = int(predictions["final_pred"].notna().sum())
+        result["members"] = " ".join(probs)
+
+        # Returned with the result so the parent can merge the per-file statistics
+        monitor = monitor_inputs(input_df, model_to_data, DriftMonitor(worker_reference))
+        report = monitor.report()
+        report.to_csv(os.path.join(output_dir, f"{name}_drift.csv"), index=False)
+        result["alerts"] = len(alerts(report))
+        result["monitor"] = monitor
+    except Exception as e:
+        # One bad extract should not stop the rest of the batch
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def run_batch(paths, output_dir=OUTPUT_DIR, workers=None, encoding=FEATURE_ENCODING, engine=INPUT_ENGINE,
+              fmt="csv", include_input=True, member_probs=False, chunk_size=100_000, quiet=False):
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    # Checked up front so a missing pyarrow or a stale operating point fails once instead of once per file
+    output_format(output_dir, fmt)
+    threshold = load_threshold(encoding=encoding)
+    reference = load_reference()
+
+    names = output_names(paths)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(encoding, threshold, reference)) as pool:
+        futures = [
+            pool.submit(score_file, path, names[path], output_dir, encoding, engine, fmt, include_input, member_probs, chunk_size)
+            for path in paths
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            status = result["error"] or f"{result['scored_rows']}/{result['rows']} rows scored by {result['members']}, {result['alerts']} drift alerts"
+            if result["error"] or not quiet:
+                print(f"{result['file']}: {status}")
+            results.append(result)
+
+    # Drift over the whole batch from the merged per-file statistics
+    monitor = DriftMonitor(reference)
+    for result in results:
+        if result["monitor"] is not None:
+            monitor.merge(result.pop("monitor"))
+    drift = monitor.report()
+    drift.to_csv(os.path.join(output_dir, "summary_drift.csv"), index=False)
+
+    files = pd.DataFrame(results).drop(columns="monitor", errors="ignore").sort_values("file")
+    per_worker = files.groupby("worker").agg(files=("file", "count"), rows=("rows", "sum"), seconds=("seconds", "sum"))
+    per_worker["rows_per_sec"] = per_worker["rows"] / per_worker["seconds"]
+
+    files.to_csv(os.path.join(output_dir, "summary_files.csv"), index=False)
+    per_worker.to_csv(os.path.join(output_dir, "summary_workers.csv"))
+    return files, per_worker, drift
+
+def main():
+    parser = argparse.ArgumentParser(description="Score many input extracts with the ensemble in a process pool")
+    parser.add_argument("inputs", nargs="+", help="input CSV files, directories or glob patterns")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="where per-file predictions and summaries are written")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--encoding", choices=["onehot", "categorical"], default=FEATURE_ENCODING, help="feature encoding and matching model set")
+    parser.add_argument("--engine", choices=["c", "pyarrow"], default=INPUT_ENGINE, help="CSV parser")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], default="csv", help="predictions file format")
+    parser.add_argument("--ids-only", action="store_true", help="write only the ID column and predictions instead of every input column")
+    parser.add_argument("--member-probs", action="store_true", help="also write each member's positive-class probability")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows per written chunk")
+    parser.add_argument("--quiet", action="store_true", help="only print failed files and the final summary")
+    args = parser.parse_args()
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("no input files matched")
+
+    start = time.perf_counter()
+    files, per_worker, drift = run_batch(
+        paths, args.output_dir, args.workers, args.encoding, args.engine,
+        args.format, not args.ids_only, args.member_probs, args.chunk_size, args.quiet
+    )
+    elapsed = time.perf_counter() - start
+
+    failed = (files["error"] != "").sum()
+    print(f"Scored {files['scored_rows'].sum()} of {files['rows'].sum()} rows from {len(files) - failed} files in {elapsed:.2f}s ({failed} failed)")
+    print("Rows/sec per worker:")
+    print(per_worker.round(2).to_string())
+
+    batch_alerts = alerts(drift)
+    print(f"Drift over the whole batch: {len(batch_alerts)} alerts (see summary_drift.csv)")
+    for alert in batch_alerts:
+        print(alert)
+
+if __name__ == "__main__":
+    main()
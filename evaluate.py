@@ -0,0 +1,198 @@
+# evaluate.py
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, Memory
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from sklearn.metrics import (
+    accuracy_score,
+    precision_score,
+    recall_score,
+    f1_score,
+    roc_auc_score,
+    confusion_matrix,
+    ConfusionMatrixDisplay,
+    RocCurveDisplay
+)
+from main import FEATURE_ENCODING, MODEL_DATASETS, MODEL_WEIGHTS, category_codes
+from models.depression_anxiety_rf_model import build_model as build_da_rf
+from models.depression_anxiety_xg_model import build_model as build_da_xg
+from models.student_depression_rf_model import build_model as build_sd_rf
+from models.student_depression_xg_model import build_model as build_sd_xg
+from models.anxiety_depression_rf_model import build_model as build_ad_rf
+from scripts.preprocessing import ROOT_DIR, load_processed
+from scripts.evaluation import fold_splits, fold_predictions
+
+
+CACHE_DIR = os.path.join(ROOT_DIR, "output/eval_cache")
+OUTPUT_DIR = "output/evaluation"
+
+# Model builder per ensemble member, the datasets come from main.MODEL_DATASETS
+MODEL_BUILDERS = {
+    "da_rf": build_da_rf,
+    "da_xg": build_da_xg,
+    "sd_rf": build_sd_rf,
+    "sd_xg": build_sd_xg,
+    "ad_rf": build_ad_rf
+}
+
+# Members evaluated here that are not part of the scoring ensemble in main.py
+EVALUATION_DATASETS = {
+    "ad_rf": "anxiety_depression"
+}
+
+# Ensemble members -> (dataset spec in scripts/preprocessing.py, model builder)
+MEMBERS = {
+    name: ({**MODEL_DATASETS, **EVALUATION_DATASETS}[name], build)
+    for name, build in MODEL_BUILDERS.items()
+}
+
+def build_member(member, encoding=FEATURE_ENCODING):
+    # Unfitted member for the encoding, XGBoost members split natively on categorical features
+    model = MEMBERS[member][1]()
+    if "enable_categorical" in model.get_params():
+        model.set_params(enable_categorical=(encoding == "categorical"))
+    return model
+
+def cross_validate(n_splits=5, seed=42, n_jobs=-1, cache_dir=CACHE_DIR, encoding=FEATURE_ENCODING):
+    """
+    Out-of-fold probabilities for every member on the processed data of the
+    given feature encoding, with members without categorical support fed
+    the category codes as in main.py. Fold splits and per-fold predictions
+    are cached in cache_dir keyed on the data, split and model parameters,
+    so only folds where one of those changed are refit.
+    """
+    memory = Memory(cache_dir, verbose=0)
+    cached_splits = memory.cache(fold_splits)
+    cached_predictions = memory.cache(fold_predictions)
+
+    data = {}
+    for name in dict.fromkeys(dataset for dataset, _ in MEMBERS.values()):
+        X, y = load_processed(name, encoding)
+        data[name] = (X, y.to_numpy(), cached_splits(y.to_numpy(), n_splits, seed))
+
+    models = {member: build_member(member, encoding) for member in MEMBERS}
+    inputs = {}
+    for member, (dataset, _) in MEMBERS.items():
+        X, y, fold_ids = data[dataset]
+        if not getattr(models[member], "enable_categorical", False):
+            X = category_codes(X)
+        inputs[member] = (X, y, fold_ids)
+
+    tasks = [
+        (member, fold)
+        for member in MEMBERS
+        for fold in range(n_splits)
+    ]
+
+    print(f"Cross-validating {len(MEMBERS)} members over {n_splits} folds on the {encoding} encoding...")
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(cached_predictions)(models[member], *inputs[member], fold)
+        for member, fold in tasks
+    )
+
+    oof = {}
+    for (member, fold), probs in zip(tasks, results):
+        _, y, fold_ids = data[MEMBERS[member][0]]
+        if member not in oof:
+            oof[member] = np.empty(len(y))
+        oof[member][fold_ids == fold] = probs
+
+    return data, oof
+
+def ensemble_probabilities(data, oof, weights=MODEL_WEIGHTS):
+    """
+    Per-dataset ensemble: weighted vote of the members trained on each
+    dataset, normalised the same way as main.py. The training datasets do
+    not share rows, so members of different datasets are never combined and
+    only the relative weights within a dataset affect the result. The full
+    cross-dataset vote main.py casts on inputs with every partition is not
+    evaluated here.
+    """
+    ensemble = {}
+    for name in data:
+        members = [m for m, (dataset, _) in MEMBERS.items() if dataset == name]
+        total = sum(weights.get(m, 1.0) for m in members)
+        ensemble[name] = sum(oof[m] * weights.get(m, 1.0) for m in members) / total
+    return ensemble
+
+def score_folds(y, y_prob, fold_ids, threshold=0.5):
+    rows = []
+    for fold in np.unique(fold_ids):
+        mask = fold_ids == fold
+        y_true = y[mask]
+        y_pred = (y_prob[mask] >= threshold).astype(int)
+        rows.append({
+            "fold": int(fold),
+            "accuracy": accuracy_score(y_true, y_pred),
+            "precision": precision_score(y_true, y_pred, zero_division=0),
+            "recall": recall_score(y_true, y_pred, zero_division=0),
+            "f1": f1_score(y_true, y_pred, zero_division=0),
+            "roc_auc": roc_auc_score(y_true, y_prob[mask])
+        })
+    return pd.DataFrame(rows)
+
+def save_plots(name, y, y_prob, output_dir, threshold=0.5):
+    y_pred = (y_prob >= threshold).astype(int)
+
+    cm = confusion_matrix(y, y_pred)
+    disp = ConfusionMatrixDisplay(confusion_matrix=cm)
+    disp.plot(cmap="Blues")
+    plt.title(f"Confusion Matrix ({name}, out-of-fold)")
+    plt.savefig(os.path.join(output_dir, f"confusion_{name}.png"), bbox_inches="tight")
+    plt.close()
+
+    RocCurveDisplay.from_predictions(y, y_prob, name=name)
+    plt.title(f"ROC Curve ({name}, out-of-fold)")
+    plt.savefig(os.path.join(output_dir, f"roc_{name}.png"), bbox_inches="tight")
+    plt.close()
+
+def evaluate(n_splits=5, seed=42, n_jobs=-1, cache_dir=CACHE_DIR, output_dir=OUTPUT_DIR, plots=True, encoding=FEATURE_ENCODING):
+    data, oof = cross_validate(n_splits, seed, n_jobs, cache_dir, encoding)
+    ensemble = ensemble_probabilities(data, oof)
+
+    scored = [(m, MEMBERS[m][0], oof[m]) for m in MEMBERS]
+    scored += [(f"per_dataset_ensemble_{name}", name, probs) for name, probs in ensemble.items()]
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    per_fold = []
+    for name, dataset, y_prob in scored:
+        _, y, fold_ids = data[dataset]
+        folds = score_folds(y, y_prob, fold_ids)
+        folds.insert(0, "dataset", dataset)
+        folds.insert(0, "model", name)
+        per_fold.append(folds)
+        if plots:
+            save_plots(name, y, y_prob, output_dir)
+
+    per_fold = pd.concat(per_fold, ignore_index=True)
+    summary = per_fold.drop(columns="fold").groupby(["model", "dataset"], sort=False).agg(["mean", "std"])
+    summary.columns = [f"{metric}_{stat}" for metric, stat in summary.columns]
+
+    per_fold.to_csv(os.path.join(output_dir, "metrics_per_fold.csv"), index=False)
+    summary.to_csv(os.path.join(output_dir, "metrics_summary.csv"))
+    print(f"Metrics written to {output_dir}")
+
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Stratified k-fold evaluation of the ensemble members and per-dataset weighted ensembles")
+    parser.add_argument("--folds", type=int, default=5, help="number of stratified folds")
+    parser.add_argument("--seed", type=int, default=42, help="fold shuffling seed")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel fold fits (-1 = all cores)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="on-disk cache for fold splits and predictions")
+    parser.add_argument("--encoding", choices=["onehot", "categorical"], default=FEATURE_ENCODING, help="feature encoding of the processed data and members")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="where metrics and plots are written")
+    parser.add_argument("--no-plots", action="store_true", help="only write metrics")
+    args = parser.parse_args()
+
+    summary = evaluate(args.folds, args.seed, args.jobs, args.cache_dir, args.output_dir, not args.no_plots, args.encoding)
+    print(summary[["accuracy_mean", "f1_mean", "recall_mean", "roc_auc_mean"]].round(4).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# generate.py
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from main import ID_COLUMN, raw_columns, label_columns
+from scripts.preprocessing import ROOT_DIR, SPECS
+
+
+OUTPUT_PATH = "raw/input/synthetic.csv"
+
+# Numeric columns with more distinct values than this are sampled from their quantile function
+MAX_DISCRETE_VALUES = 50
+QUANTILES = 1001
+MAX_DECIMALS = 4
+
+# Marginals set once per worker process by init_worker
+worker_marginals = None
+
+def init_worker(marginals):
+    global worker_marginals
+    worker_marginals = marginals
+
+def load_training(datasets):
+    return {dataset: pd.read_csv(os.path.join(ROOT_DIR, SPECS[dataset]["raw_path"])) for dataset in datasets}
+
+def decimals(values):
+    # Fewest decimals that reproduce the training values, so the output looks like the training files
+    for d in range(MAX_DECIMALS):
+        if np.allclose(values, np.round(values, d)):
+            return d
+    return MAX_DECIMALS
+
+def learn_column(values):
+    missing = float(values.isna().mean())
+    present = values.dropna()
+    if pd.api.types.is_numeric_dtype(present) and not pd.api.types.is_bool_dtype(present) and present.nunique() > MAX_DISCRETE_VALUES:
+        present = present.to_numpy(dtype=float)
+        return {
+            "kind": "continuous",
+            "missing": missing,
+            "quantiles": np.quantile(present, np.linspace(0, 1, QUANTILES)),
+            "decimals": decimals(present)
+        }
+    frequencies = present.value_counts(normalize=True)
+    return {
+        "kind": "discrete",
+        "missing": missing,
+        "values": frequencies.index.to_numpy(),
+        "probs": frequencies.to_numpy()
+    }
+
+def learn_marginals(columns=None, datasets=None):
+    """
+    Per-column marginal distributions of the raw training files: category
+    (and discrete numeric) frequencies, quantile functions of continuous
+    columns and missing rates. Columns are matched case-insensitively and a
+    column found in several files (age, gender) is learned from all of them.
+    Returns {header: marginal}, with the header as written in the first
+    training file that has the column. columns defaults to every column of
+    the given datasets.
+    """
+    training = load_training(datasets or list(SPECS))
+    headers = {}
+    for df in training.values():
+        for header in df.columns:
+            headers.setdefault(header.lower(), header)
+
+    marginals = {}
+    for col in columns or list(headers):
+        if col not in headers:
+            raise ValueError(f"Column {col} is not in any training file")
+        sources = [df[c] for df in training.values() for c in df.columns if c.lower() == col]
+        marginals[headers[col]] = learn_column(pd.concat(sources, ignore_index=True))
+    return marginals
+
+def sample_column(marginal, rows, rng):
+    missing = rng.random(rows) < marginal["missing"]
+    if marginal["kind"] == "continuous":
+        grid = np.linspace(0, 1, len(marginal["quantiles"]))
+        values = np.round(np.interp(rng.random(rows), grid, marginal["quantiles"]), marginal["decimals"])
+        values[missing] = np.nan
+        return values
+
+    # Sampled as category codes, missing rows get code -1
+    codes = rng.choice(len(marginal["values"]), size=rows, p=marginal["probs"])
+    codes[missing] = -1
+    return pd.Categorical.from_codes(codes, categories=marginal["values"])
+
+def generate_chunk(rows, start, seed):
+    # Rows start..start+rows as CSV text, formatted in the worker so the writer only copies bytes
+    rng = np.random.default_rng(seed)
+    chunk = pd.DataFrame({col: sample_column(marginal, rows, rng) for col, marginal in worker_marginals.items()})
+    if ID_COLUMN in chunk.columns:
+        chunk[ID_COLUMN] = np.arange(start + 1, start + rows + 1)
+    return chunk.to_csv(header=False, index=False)
+
+def generate(marginals, rows, path=OUTPUT_PATH, chunk_size=1_000_000, workers=None, seed=42, parts=False):
+    """
+    Write rows synthetic rows, chunk_size at a time, in a process pool.
+    Chunk i is drawn from its own seed spawned from seed, so the same seed
+    and chunk size give the same rows whatever the number of workers.
+    With parts, path is a directory of part-NNNNN.csv files (one per chunk,
+    each with a header) that batch.py can score directly, otherwise a single
+    CSV written in chunk order.
+    """
+    starts = range(0, rows, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    header = ",".join(f'"{col}"' if "," in col else col for col in marginals) + "\n"
+
+    if parts:
+        if not os.path.exists(path):
+            os.makedirs(path)
+    elif os.path.dirname(path) and not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(marginals,)) as pool:
+        out = None if parts else open(path, "w", newline="")
+        try:
+            if out is not None:
+                out.write(header)
+
+            # At most two chunks per worker in flight, so memory does not grow with rows
+            pending = deque()
+            for i, start in enumerate(starts):
+                pending.append((i, pool.submit(generate_chunk, min(chunk_size, rows - start), start, seeds[i])))
+                while len(pending) > 2 * workers or (i == len(starts) - 1 and pending):
+                    j, future = pending.popleft()
+                    if parts:
+                        with open(os.path.join(path, f"part-{j:05d}.csv"), "w", newline="") as f:
+                            f.write(header + future.result())
+                    else:
+                        out.write(future.result())
+        finally:
+            if out is not None:
+                out.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic inputs from the marginal distributions of the training data")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="number of rows to generate")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="output CSV (or directory with --parts)")
+    parser.add_argument("--dataset", choices=list(SPECS), default=None, help="generate a training file shaped like this dataset instead of the main.py input")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--parts", action="store_true", help="write one CSV per chunk into the --output directory")
+    args = parser.parse_args()
+
+    if args.dataset:
+        marginals = learn_marginals(datasets=[args.dataset])
+    else:
+        # Every raw column main.py reads, in partition order, learned from the partitions' datasets
+        columns = list(dict.fromkeys([c for features in raw_columns.values() for c in features] + label_columns))
+        marginals = learn_marginals(columns, list(raw_columns))
+
+    start = time.perf_counter()
+    generate(marginals, args.rows, args.output, args.chunk_size, args.workers, args.seed, args.parts)
+    elapsed = time.perf_counter() - start
+    print(f"Generated {args.rows} rows x {len(marginals)} columns to {args.output} in {elapsed:.2f}s ({args.rows / elapsed:.0f} rows/sec)")
+
+if __name__ == "__main__":
+    main()
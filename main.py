@@ -2,25 +2,38 @@
 import pandas as pd
 import numpy as np
 import joblib
+import json
 import os
-from scripts.student_depression_processor import preprocess_student_depression
-from scripts.depression_anxiety_processor import preprocess_depression_anxiety
+import argparse
+from scripts.preprocessing import SPECS, preprocess
+from scripts.ingestion import read_input
+from scripts.output import write_output, summarize
+from scripts.monitoring import DriftMonitor, load_reference, alerts
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.metrics import f1_score
 
 
 MODEL_DIR = "models/models_saved"
+INPUT_ENGINE = "c"  # "pyarrow" to use the pyarrow CSV parser when installed
+FEATURE_ENCODING = "onehot"  # "categorical" for category-code inputs and the *_categorical models
+OPERATING_POINT_PATH = os.path.join(MODEL_DIR, "operating_point.json")
+ID_COLUMN = "id"  # written with --ids-only when the input has it, otherwise the file line
+PREVIEW_ROWS = 20  # rows of the prediction table printed without --quiet
+
+MODEL_FILES = {
+    "da_rf": "model_depression_anxiety_rf.pkl",
+    "da_xg": "model_depression_anxiety_xg.pkl",
+    "sd_rf": "model_student_depression_rf.pkl",
+    "sd_xg": "model_student_depression_xg.pkl"
+}
 
-def load_model(name):
-    path = os.path.join(MODEL_DIR, name)
-    return joblib.load(path)
-    
-models = {
-    "da_rf": load_model("model_depression_anxiety_rf.pkl"),
-    "da_xg": load_model("model_depression_anxiety_xg.pkl"),
-    "sd_rf": load_model("model_student_depression_rf.pkl"),
-    "sd_xg": load_model("model_student_depression_xg.pkl")
+# Ensemble member -> preprocessing spec in scripts/preprocessing.py
+MODEL_DATASETS = {
+    "da_rf": "depression_anxiety",
+    "da_xg": "depression_anxiety",
+    "sd_rf": "student_depression",
+    "sd_xg": "student_depression"
 }
 
 MODEL_WEIGHTS = {
@@ -71,155 +84,218 @@ feature_groups = [
     ],  
 ]
 
-# Raw data
-raw_columns = [
-    # Raw columns in depression_anxiety
-    [
-        "school_year",
-        "age",
-        "gender",
-        "bmi",
-        "who_bmi",
-        "phq_score",
-        "depression_severity",
-        "suicidal",
-        "depression_diagnosis",
-        "depression_treatment",
-        "gad_score",
-        "anxiety_severity",
-        "anxiousness",
-        "anxiety_diagnosis",
-        "anxiety_treatment",
-        "epworth_score",
-        "sleepiness"
-    ],  
-    # Raw columns in student_depression
-    [      
-        "gender",
-        "age",
-        "academic pressure",
-        "work pressure",
-        "cgpa",
-        "study satisfaction",
-        "job satisfaction",
-        "sleep duration",
-        "dietary habits",
-        "degree",
-        "work/study hours",
-        "financial stress",
-        "profession",
-        "have you ever had suicidal thoughts ?",
-        "family history of mental illness"
-    ],  
+# Label columns read alongside the features for scoring
+label_columns = [
+    "depressiveness"
 ]
 
-# Load input
-input_df = pd.read_csv("raw/input/input.csv")
-input_df.columns = input_df.columns.str.lower()
-
-model_inputs = {}
-processed_inputs = {}
-ensemble_preds = {}
-
-print("Partitioning features...")
-
-for i, features in enumerate(raw_columns):
-    # Keep only columns that exist in input_df
-    cols_to_use = [c for c in features if c in input_df.columns]
-    
-    model_inputs[f"dataset{i}"] = input_df[cols_to_use].copy()
-
-for key, df in model_inputs.items():
-    if key == 'dataset0':
-        processed_inputs[key] = preprocess_depression_anxiety(df)
-    if key == 'dataset1':
-        processed_inputs[key] = preprocess_student_depression(df)
-
-# map models to processed datasets
-model_to_data = {
-    "da_rf": processed_inputs["dataset0"],
-    "da_xg": processed_inputs["dataset0"],
-    "sd_rf": processed_inputs["dataset1"],
-    "sd_xg": processed_inputs["dataset1"]
+# Raw columns of each partition
+raw_columns = {
+    dataset: SPECS[dataset]["input_columns"]
+    for dataset in dict.fromkeys(MODEL_DATASETS.values())
 }
 
-print("Feeding partitions to models...")
-
-for name, model in models.items():
-    df_proc = model_to_data[name]  # select the correct processed dataset
-    
-    preds = model.predict(df_proc)
-    probs = model.predict_proba(df_proc).max(axis=1)  # confidence per row
-
-    pred_df = df_proc.copy()
-    pred_df["pred_class"] = preds
-    pred_df["pred_confidence"] = probs
-
-    # Save predictions in a dictionary
-    ensemble_preds[name] = pred_df
-
-print("Evaluating predictions and voting...")
-
-# Ensemble prediction & voting
-num_rows = list(ensemble_preds.values())[0].shape[0]
-classes = sorted(list(models["da_rf"].classes_))  # assume consistent classes
-
-# Probability array for each model
-proba_matrix = np.zeros((num_rows, len(classes)))
-
-# Combine probabilities with weights
-for name, pred_df in ensemble_preds.items():
-    model = models[name]
-    weights = MODEL_WEIGHTS.get(name, 1.0)
-
-    # Get the model's raw probabilities
-    model_probs = model.predict_proba(model_to_data[name])
-
-    # Weighted contribution: weighted sum of probs
-    proba_matrix += model_probs * weights
-
-# Final prediction = argmax of weighted probability sum
-final_preds = np.array(classes)[np.argmax(proba_matrix, axis=1)]
-
-# Highest combined probability per row
-final_confidence = proba_matrix.max(axis=1) / proba_matrix.sum(axis=1)
-
-# Build final output DataFrame
-final_df = input_df.copy()
-final_df["final_pred"] = final_preds
-final_df["final_confidence_percent"] = final_confidence * 100
-
-# Save to CSV
-final_df.to_csv("output/ensemble_final_predictions.csv", index=False)
-
-print("Weighted voting predictions:")
-print(final_df)
-
-# Correlation matrix of model predictions + ensemble
-model_pred_df = pd.DataFrame({name: df['pred_class'] for name, df in ensemble_preds.items()})
-model_pred_df['ensemble_final'] = final_preds
-sns.heatmap(model_pred_df.corr(), annot=True, fmt=".2f", cmap="coolwarm")
-plt.title("Correlation Matrix of Model Predictions and Ensemble")
-plt.show()
-
-# F1 score
-y_true = input_df['depressiveness'].values
-print(f"Ensemble F1 Score: {f1_score(y_true, final_preds):.4f}")
-
-# Weighted feature importance
-fi_df = pd.DataFrame({
-    f: sum(model.feature_importances_[i] * MODEL_WEIGHTS.get(name,1.0)
-           for name, model in models.items() if hasattr(model,'feature_importances_')
-           for i, col in enumerate(model_to_data[name].columns) if col==f)
-    for f in set(col for df in model_to_data.values() for col in df.columns)
-}, index=['importance']).T.sort_values('importance', ascending=False)
-
-print("Top features considered by the ensemble:")
-print(fi_df.head(20))
+def load_model(name):
+    path = os.path.join(MODEL_DIR, name)
+    return joblib.load(path)
 
-plt.barh(fi_df.head(20).index, fi_df.head(20)['importance'], color='skyblue')
-plt.gca().invert_yaxis()
-plt.xlabel("Weighted Feature Importance")
-plt.title("Top Features in the Ensemble")
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+def load_models(encoding=FEATURE_ENCODING):
+    if encoding == "categorical":
+        return {name: load_model(file.replace(".pkl", "_categorical.pkl")) for name, file in MODEL_FILES.items()}
+    return {name: load_model(file) for name, file in MODEL_FILES.items()}
+
+def category_codes(df):
+    # Models without native categorical support split on the integer codes
+    cat_cols = df.select_dtypes("category").columns
+    if len(cat_cols) == 0:
+        return df
+    return df.assign(**{col: df[col].cat.codes for col in cat_cols})
+
+def load_threshold(path=OPERATING_POINT_PATH, encoding=FEATURE_ENCODING):
+    """
+    Decision threshold chosen by tune_threshold.py, None (argmax voting) if
+    none was saved. A point tuned with other MODEL_WEIGHTS or another
+    feature encoding is refused instead of applied silently.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        point = json.load(f)
+
+    if point.get("model_weights") != MODEL_WEIGHTS or point.get("encoding") != encoding:
+        raise ValueError(
+            f"{path} was tuned for weights {point.get('model_weights')} and encoding {point.get('encoding')}, "
+            f"but the ensemble uses {MODEL_WEIGHTS} and {encoding}. Re-run tune_threshold.py or remove the file"
+        )
+    return point["threshold"]
+
+def partition_inputs(input_df, encoding=FEATURE_ENCODING):
+    # Preprocess every partition whose raw columns are all present in input_df
+    processed_inputs = {}
+    for dataset, features in raw_columns.items():
+        if all(c in input_df.columns for c in features):
+            processed_inputs[dataset] = preprocess(dataset, input_df[features].copy(), encoding)
+    return processed_inputs
+
+def score(input_df, models, threshold=None, encoding=FEATURE_ENCODING):
+    """
+    Weighted vote of every member whose partition is present in input_df.
+    Rows are matched on input_df's index, so a row dropped by one partition
+    is still scored by the others. Returns (predictions, member_probs,
+    model_to_data), where predictions holds final_pred and
+    final_confidence_percent per input row (missing if no member scored it).
+    """
+    processed_inputs = partition_inputs(input_df, encoding)
+
+    # map models to processed datasets
+    model_to_data = {
+        name: processed_inputs[MODEL_DATASETS[name]]
+        for name in models if MODEL_DATASETS[name] in processed_inputs
+    }
+    if not model_to_data:
+        raise ValueError("Input does not contain all raw columns of any partition")
+
+    for name in model_to_data:
+        if not getattr(models[name], "enable_categorical", False):
+            model_to_data[name] = category_codes(model_to_data[name])
+
+    classes = sorted(list(next(iter(models.values())).classes_))  # assume consistent classes
+
+    # Probability array for each model
+    proba_matrix = np.zeros((len(input_df), len(classes)))
+    member_probs = {}
+
+    # Combine probabilities with weights
+    for name, df_proc in model_to_data.items():
+        model_probs = models[name].predict_proba(df_proc)
+        member_probs[name] = pd.DataFrame(model_probs, columns=classes, index=df_proc.index)
+
+        # Weighted contribution: weighted sum of probs
+        rows = input_df.index.get_indexer(df_proc.index)
+        proba_matrix[rows] += model_probs * MODEL_WEIGHTS.get(name, 1.0)
+
+    total = proba_matrix.sum(axis=1)
+    scored = total > 0
+    total[~scored] = 1.0
+
+    if threshold is None:
+        # Final prediction = argmax of weighted probability sum
+        final_preds = np.array(classes)[np.argmax(proba_matrix, axis=1)]
+
+        # Highest combined probability per row
+        final_confidence = proba_matrix.max(axis=1) / total
+    else:
+        # Final prediction = weighted positive share against the tuned operating point
+        positive_share = proba_matrix[:, 1] / total
+        final_preds = np.array(classes)[(positive_share >= threshold).astype(int)]
+
+        # Combined probability of the predicted class
+        final_confidence = np.where(final_preds == classes[1], positive_share, 1 - positive_share)
+
+    predictions = pd.DataFrame({
+        "final_pred": pd.Series(final_preds, index=input_df.index).where(scored).astype("Int64"),
+        "final_confidence_percent": pd.Series(final_confidence * 100, index=input_df.index).where(scored)
+    })
+
+    return predictions, member_probs, model_to_data
+
+def monitor_inputs(input_df, model_to_data, monitor):
+    # One processed frame per partition, members sharing a partition see the same rows
+    processed_inputs = {MODEL_DATASETS[name]: df for name, df in model_to_data.items()}
+    monitor.update(input_df, processed_inputs)
+    return monitor
+
+def main():
+    parser = argparse.ArgumentParser(description="Score the input file with the weighted ensemble")
+    parser.add_argument("--input", default="raw/input/input.csv", help="raw input CSV")
+    parser.add_argument("--output", default="output/ensemble_final_predictions.csv", help="predictions file (.csv, .parquet or .arrow)")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], default=None, help="output format (default: from the file extension)")
+    parser.add_argument("--ids-only", action="store_true", help="write only the ID column and predictions instead of every input column")
+    parser.add_argument("--member-probs", action="store_true", help="also write each member's positive-class probability")
+    parser.add_argument("--no-monitor", action="store_true", help="skip the drift and data-quality checks")
+    parser.add_argument("--quiet", action="store_true", help="print a summary instead of the prediction table and skip the plots and feature report")
+    args = parser.parse_args()
+
+    models = load_models()
+
+    # Load input
+    input_df, malformed = read_input(
+        args.input,
+        columns=[ID_COLUMN] + [c for features in raw_columns.values() for c in features] + label_columns,
+        engine=INPUT_ENGINE
+    )
+
+    if not malformed.empty:
+        # One report entry per bad value, so a row can be listed more than once
+        malformed_path = os.path.join(os.path.dirname(args.output), "malformed_rows.csv")
+        malformed.to_csv(malformed_path, index=False)
+        print(f"Skipped {malformed['line'].nunique()} malformed rows, see {malformed_path}")
+
+    print("Partitioning features, feeding partitions to models and voting...")
+
+    predictions, member_probs, model_to_data = score(input_df, models, load_threshold())
+    final_preds = predictions["final_pred"]
+
+    # Save predictions, streamed in chunks with the input columns echoed from the file as written
+    write_output(
+        args.output,
+        predictions,
+        fmt=args.format,
+        input_df=input_df,
+        member_probs=member_probs if args.member_probs else None,
+        id_column=ID_COLUMN,
+        include_input=not args.ids_only,
+        input_path=args.input,
+        skip_lines=malformed["line"]
+    )
+
+    if not args.no_monitor:
+        report = monitor_inputs(input_df, model_to_data, DriftMonitor(load_reference())).report()
+        report.to_csv("output/drift_report.csv", index=False)
+        for alert in alerts(report):
+            print(alert)
+
+    if args.quiet:
+        print(f"{summarize(predictions)}, written to {args.output}")
+    else:
+        print(f"Weighted voting predictions (first {PREVIEW_ROWS} rows):")
+        print(input_df.head(PREVIEW_ROWS).join(predictions))
+
+    # F1 score over the rows that were scored and have a label
+    if "depressiveness" in input_df.columns:
+        scored = final_preds.notna() & input_df["depressiveness"].notna()
+        y_true = input_df.loc[scored, 'depressiveness'].to_numpy(dtype=int)
+        print(f"Ensemble F1 Score: {f1_score(y_true, final_preds[scored].to_numpy(dtype=int)):.4f}")
+    else:
+        print("No depressiveness labels in the input, skipping F1")
+
+    if args.quiet:
+        return
+
+    # Correlation matrix of model predictions + ensemble
+    model_pred_df = pd.DataFrame({name: probs.idxmax(axis=1) for name, probs in member_probs.items()})
+    model_pred_df['ensemble_final'] = final_preds
+    sns.heatmap(model_pred_df.astype(float).corr(), annot=True, fmt=".2f", cmap="coolwarm")
+    plt.title("Correlation Matrix of Model Predictions and Ensemble")
+    plt.show()
+
+    # Weighted feature importance
+    fi_df = pd.DataFrame({
+        f: sum(models[name].feature_importances_[i] * MODEL_WEIGHTS.get(name,1.0)
+               for name, df in model_to_data.items() if hasattr(models[name],'feature_importances_')
+               for i, col in enumerate(df.columns) if col==f)
+        for f in set(col for df in model_to_data.values() for col in df.columns)
+    }, index=['importance']).T.sort_values('importance', ascending=False)
+
+    print("Top features considered by the ensemble:")
+    print(fi_df.head(20))
+
+    plt.barh(fi_df.head(20).index, fi_df.head(20)['importance'], color='skyblue')
+    plt.gca().invert_yaxis()
+    plt.xlabel("Weighted Feature Importance")
+    plt.title("Top Features in the Ensemble")
+    plt.tight_layout()
+    plt.show()
+
+if __name__ == "__main__":
+    main()
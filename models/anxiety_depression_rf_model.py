@@ -1,48 +1,95 @@
 import pandas as pd
+import argparse
 import matplotlib.pyplot as plt
 import seaborn as sns
+import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, accuracy_score, confusion_matrix, ConfusionMatrixDisplay
+from sklearn.metrics import (
+    classification_report,
+    accuracy_score,
+    confusion_matrix,
+    ConfusionMatrixDisplay
+)
+import os
+from scripts.preprocessing import ROOT_DIR, load_processed
 
-# Load CSV
-df = pd.read_csv("../pre_processed/processed_anxiety_depression.csv")
+MODEL_PATH = os.path.join(ROOT_DIR, "models/models_saved/model_anxiety_depression_rf.pkl")
+CATEGORICAL_MODEL_PATH = os.path.join(ROOT_DIR, "models/models_saved/model_anxiety_depression_rf_categorical.pkl")
 
-# Separate features/labels
-X = df.drop("is_depressed", axis=1)
-y = df["is_depressed"]
+# Actual model
+def build_model():
+    return RandomForestClassifier(
+        n_estimators=300,
+        random_state=42,
+        class_weight="balanced"
+    )
 
-# Train-test split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
+def train_model(encoding="onehot"):
+    # Load data, random forests split on the integer codes of categorical features
+    X, y = load_processed("anxiety_depression", encoding, codes=True)
+
+    # Train-test split
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+
+    model = build_model()
+
+    print("Training Random Forest model...")
+    model.fit(X_train, y_train)
+
+    # Save model
+    model_path = CATEGORICAL_MODEL_PATH if encoding == "categorical" else MODEL_PATH
+    joblib.dump(model, model_path, compress=3)
+    print(f"Model saved to {model_path}")
+
+    return model, X_test, y_test
+
+def evaluate_model(model, X_test, y_test):
+    y_pred = model.predict(X_test)
+
+    print("Accuracy:", accuracy_score(y_test, y_pred))
+    print("\nClassification Report:\n", classification_report(y_test, y_pred))
+
+    # Confusion matrix
+    cm = confusion_matrix(y_test, y_pred)
+    disp = ConfusionMatrixDisplay(confusion_matrix=cm)
+    disp.plot(cmap="Blues")
+    plt.title("Confusion Matrix")
+    plt.show()
+
+    return y_pred
 
-# Random Forest model
-model = RandomForestClassifier(
-    n_estimators=300, 
-    random_state=42, 
-    class_weight="balanced")
+def plot_feature_correlation(X):
+    plt.figure(figsize=(12, 10))
+    corr = X.corr()
+    sns.heatmap(corr, cmap="viridis", annot=False)
+    plt.title("Feature Correlation Matrix")
+    plt.show()
 
+def predict_with_confidence(model, X):
+    # Get predicted classification
+    predictions = model.predict(X)
+    
+    # Get predicted probabilities
+    proba = model.predict_proba(X)
+    
+    # Confidence score
+    confidences = [proba[i, pred] for i, pred in enumerate(predictions)]
+    
+    return predictions, confidences
 
-print("Training model...")
-model.fit(X_train, y_train)
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--encoding", choices=["onehot", "categorical"], default="onehot")
+    args = parser.parse_args()
 
-print("Evaluating model...")
-y_pred = model.predict(X_test)
+    model, X_test, y_test = train_model(encoding=args.encoding)
 
-print("Accuracy:", accuracy_score(y_test, y_pred))
-print("\nClassification Report:\n", classification_report(y_test, y_pred))
+    y_pred = evaluate_model(model, X_test, y_test)
 
-# Confusion matrix 
-cm = confusion_matrix(y_test, y_pred)
-disp = ConfusionMatrixDisplay(confusion_matrix=cm)
-disp.plot(cmap="Blues")
-plt.title("Confusion Matrix")
-plt.show()
+    plot_feature_correlation(X_test)
 
-# Correlation Matrix
-plt.figure(figsize=(12, 10))
-corr = X.corr()  # Correlation of features only
-sns.heatmap(corr, cmap="viridis", annot=False)
-plt.title("Feature Correlation Matrix")
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
+import argparse
 import joblib
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import (
@@ -10,34 +11,39 @@ from sklearn.metrics import (
     ConfusionMatrixDisplay
 )
 from sklearn.model_selection import train_test_split
+import os
+from scripts.preprocessing import ROOT_DIR, load_processed
 
-MODEL_PATH = "models_saved/model_depression_anxiety_rf.pkl"
+MODEL_PATH = os.path.join(ROOT_DIR, "models/models_saved/model_depression_anxiety_rf.pkl")
+CATEGORICAL_MODEL_PATH = os.path.join(ROOT_DIR, "models/models_saved/model_depression_anxiety_rf_categorical.pkl")
+
+# Actual model
+def build_model():
+    return RandomForestClassifier(
+        n_estimators=300,
+        random_state=42,
+        class_weight="balanced"
+    )
 
 # Actually train the model
-def train_model(data_path="../pre_processed/processed_depression_anxiety.csv"):
-    # Load data
-    df = pd.read_csv(data_path)
-    X = df.drop("depressiveness", axis=1)
-    y = df["depressiveness"]
+def train_model(encoding="onehot"):
+    # Load data, random forests split on the integer codes of categorical features
+    X, y = load_processed("depression_anxiety", encoding, codes=True)
     
     # Train-test split
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42, stratify=y
     )
 
-    # Actual model
-    model = RandomForestClassifier(
-        n_estimators=300,
-        random_state=42,
-        class_weight="balanced"
-    )
+    model = build_model()
 
     print("Training Random Forest model...")
     model.fit(X_train, y_train)
 
     # Save model
-    joblib.dump(model, MODEL_PATH, compress=3)
-    print(f"Model saved to {MODEL_PATH}")
+    model_path = CATEGORICAL_MODEL_PATH if encoding == "categorical" else MODEL_PATH
+    joblib.dump(model, model_path, compress=3)
+    print(f"Model saved to {model_path}")
 
     return model, X_test, y_test
 
@@ -77,7 +83,11 @@ def predict_with_confidence(model, X):
     return predictions, confidences
 
 def main():
-    model, X_test, y_test = train_model()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--encoding", choices=["onehot", "categorical"], default="onehot")
+    args = parser.parse_args()
+
+    model, X_test, y_test = train_model(encoding=args.encoding)
 
     y_pred = evaluate_model(model, X_test, y_test)
 
@@ -1,4 +1,5 @@
 import pandas as pd
+import argparse
 import matplotlib.pyplot as plt
 import seaborn as sns
 import joblib
@@ -10,36 +11,42 @@ from sklearn.metrics import (
     ConfusionMatrixDisplay
 )
 import xgboost as xgb
+import os
+from scripts.preprocessing import ROOT_DIR, load_processed
 
-MODEL_PATH = "models_saved/model_depression_anxiety_xg.pkl"
+MODEL_PATH = os.path.join(ROOT_DIR, "models/models_saved/model_depression_anxiety_xg.pkl")
+CATEGORICAL_MODEL_PATH = os.path.join(ROOT_DIR, "models/models_saved/model_depression_anxiety_xg_categorical.pkl")
 
-def train_model(data_path="../pre_processed/processed_depression_anxiety.csv"):
-    # Load data
-    df = pd.read_csv(data_path)
-    X = df.drop("depressiveness", axis=1)
-    y = df["depressiveness"]
-
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
-
-    # Actual model
-    model = xgb.XGBClassifier(
+# Actual model
+def build_model(encoding="onehot"):
+    return xgb.XGBClassifier(
         n_estimators=300,
         learning_rate=0.1,
         max_depth=6,
         scale_pos_weight=1,
         use_label_encoder=False,
         eval_metric='logloss',
+        enable_categorical=(encoding == "categorical"),
         random_state=42
     )
 
+def train_model(encoding="onehot"):
+    # Load data
+    X, y = load_processed("depression_anxiety", encoding)
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+
+    model = build_model(encoding)
+
     print("Training XGBoost model...")
     model.fit(X_train, y_train)
 
     # Save model
-    joblib.dump(model, MODEL_PATH)
-    print(f"Model saved to {MODEL_PATH}")
+    model_path = CATEGORICAL_MODEL_PATH if encoding == "categorical" else MODEL_PATH
+    joblib.dump(model, model_path)
+    print(f"Model saved to {model_path}")
 
     return model, X_test, y_test
 
@@ -60,7 +67,7 @@ def evaluate_model(model, X_test, y_test, threshold=0.5):
 
 def plot_feature_correlation(X):
     plt.figure(figsize=(12, 10))
-    corr = X.corr()
+    corr = X.corr(numeric_only=True)
     sns.heatmap(corr, cmap="viridis", annot=False)
     plt.title("Feature Correlation Matrix")
     plt.show()
@@ -79,7 +86,11 @@ def predict_with_confidence(model, X, threshold=0.5):
 
 
 def main():
-    model, X_test, y_test = train_model()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--encoding", choices=["onehot", "categorical"], default="onehot")
+    args = parser.parse_args()
+
+    model, X_test, y_test = train_model(encoding=args.encoding)
 
     y_pred, y_prob = evaluate_model(model, X_test, y_test, threshold = 0.5)
 
@@ -1,4 +1,5 @@
 import pandas as pd
+import argparse
 import matplotlib.pyplot as plt
 import seaborn as sns
 import joblib
@@ -10,33 +11,38 @@ from sklearn.metrics import (
     confusion_matrix,
     ConfusionMatrixDisplay
 )
+import os
+from scripts.preprocessing import ROOT_DIR, load_processed
 
-MODEL_PATH = "models_saved/model_student_depression_rf.pkl"
+MODEL_PATH = os.path.join(ROOT_DIR, "models/models_saved/model_student_depression_rf.pkl")
+CATEGORICAL_MODEL_PATH = os.path.join(ROOT_DIR, "models/models_saved/model_student_depression_rf_categorical.pkl")
 
-def train_model(data_path="../pre_processed/processed_student_depression.csv"):
-    # Load data
-    df = pd.read_csv(data_path)
-    X = df.drop("depression", axis=1)
-    y = df["depression"]
+# Actual model
+def build_model():
+    return RandomForestClassifier(
+        n_estimators=300,
+        random_state=42,
+        class_weight="balanced"
+    )
+
+def train_model(encoding="onehot"):
+    # Load data, random forests split on the integer codes of categorical features
+    X, y = load_processed("student_depression", encoding, codes=True)
 
     # Train-test split
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42, stratify=y
     )
 
-    # Actual model
-    model = RandomForestClassifier(
-        n_estimators=300,
-        random_state=42,
-        class_weight="balanced"
-    )
+    model = build_model()
 
     print("Training Random Forest model...")
     model.fit(X_train, y_train)
 
     # Save model
-    joblib.dump(model, MODEL_PATH, compress=3)
-    print(f"Model saved to {MODEL_PATH}")
+    model_path = CATEGORICAL_MODEL_PATH if encoding == "categorical" else MODEL_PATH
+    joblib.dump(model, model_path, compress=3)
+    print(f"Model saved to {model_path}")
 
     return model, X_test, y_test
 
@@ -75,7 +81,11 @@ def predict_with_confidence(model, X):
     return predictions, confidences
 
 def main():
-    model, X_test, y_test = train_model()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--encoding", choices=["onehot", "categorical"], default="onehot")
+    args = parser.parse_args()
+
+    model, X_test, y_test = train_model(encoding=args.encoding)
 
     y_pred = evaluate_model(model, X_test, y_test)
 
@@ -0,0 +1,74 @@
+import pandas as pd
+import argparse
+import joblib
+import os
+import time
+import tracemalloc
+from scipy import sparse
+from scripts.preprocessing import ROOT_DIR, SPECS, preprocess
+
+MODEL_DIR = os.path.join(ROOT_DIR, "models/models_saved")
+
+def measure(func, *args):
+    # Wall time of one call, then peak traced allocation of a second (tracing slows it down)
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def csr_nbytes(matrix):
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare one-hot and categorical feature encoding on the student_depression data")
+    parser.add_argument("--scale", type=int, default=20, help="how many times to repeat the training rows")
+    args = parser.parse_args()
+
+    raw = pd.read_csv(os.path.join(ROOT_DIR, SPECS["student_depression"]["raw_path"]))
+    raw = pd.concat([raw] * args.scale, ignore_index=True)
+    raw = raw.drop(columns=["Depression"])
+    print(f"Benchmarking {len(raw)} rows")
+
+    rows = []
+    frames = {}
+    for encoding in ["onehot", "categorical"]:
+        df, elapsed, peak = measure(lambda: preprocess("student_depression", raw.copy(), encoding))
+        frames[encoding] = df
+        rows.append({
+            "representation": encoding,
+            "preprocess_s": elapsed,
+            "preprocess_peak_mb": peak / 1e6,
+            "features_mb": df.memory_usage(deep=True).sum() / 1e6
+        })
+
+    # CSR of the one-hot features for reference only: XGBoost reads its implicit zeros as missing values
+    matrix, elapsed, peak = measure(lambda: sparse.csr_matrix(frames["onehot"].to_numpy(dtype="float32")))
+    rows.append({
+        "representation": "onehot_csr",
+        "preprocess_s": rows[0]["preprocess_s"] + elapsed,
+        "preprocess_peak_mb": max(rows[0]["preprocess_peak_mb"], peak / 1e6),
+        "features_mb": csr_nbytes(matrix) / 1e6
+    })
+
+    models = {
+        "onehot": os.path.join(MODEL_DIR, "model_student_depression_xg.pkl"),
+        "categorical": os.path.join(MODEL_DIR, "model_student_depression_xg_categorical.pkl")
+    }
+    for row in rows[:2]:
+        path = models[row["representation"]]
+        if not os.path.exists(path):
+            print(f"Skipping scoring for {row['representation']}, {path} not found")
+            continue
+        model = joblib.load(path)
+        _, elapsed, _ = measure(model.predict_proba, frames[row["representation"]])
+        row["xgb_score_s"] = elapsed
+
+    print(pd.DataFrame(rows).round(3).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+
+# Cached with joblib.Memory by evaluate.py and tune_threshold.py. The cache key
+# includes the function's module, so these live in an importable module and
+# every entry point, run from any directory, shares the same cached folds.
+
+def fold_splits(y, n_splits, seed):
+    # Fold id for every row, so a split is a single integer array on disk
+    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    fold_ids = np.empty(len(y), dtype=np.int8)
+    for fold, (_, test_idx) in enumerate(skf.split(np.zeros(len(y)), y)):
+        fold_ids[test_idx] = fold
+    return fold_ids
+
+def fold_predictions(model, X, y, fold_ids, fold):
+    # Fit an unfitted member on every other fold, return P(class 1) on this fold
+    train = fold_ids != fold
+    model.fit(X[train], y[train])
+    return model.predict_proba(X[~train])[:, 1]
@@ -0,0 +1,188 @@
+import pandas as pd
+import csv
+from importlib.util import find_spec
+
+# Expected raw input schema (lowercase column names)
+RAW_SCHEMA = {
+    "id": "string",
+
+    # depression_anxiety
+    "school_year": "float64",
+    "age": "float64",
+    "gender": "category",
+    "bmi": "float64",
+    "who_bmi": "category",
+    "phq_score": "float64",
+    "depression_severity": "category",
+    "depressiveness": "boolean",
+    "suicidal": "boolean",
+    "depression_diagnosis": "boolean",
+    "depression_treatment": "boolean",
+    "gad_score": "float64",
+    "anxiety_severity": "category",
+    "anxiousness": "boolean",
+    "anxiety_diagnosis": "boolean",
+    "anxiety_treatment": "boolean",
+    "epworth_score": "float64",
+    "sleepiness": "boolean",
+
+    # student_depression
+    "profession": "category",
+    "academic pressure": "float64",
+    "work pressure": "float64",
+    "cgpa": "float64",
+    "study satisfaction": "float64",
+    "job satisfaction": "float64",
+    "sleep duration": "category",
+    "dietary habits": "category",
+    "degree": "category",
+    "have you ever had suicidal thoughts ?": "category",
+    "work/study hours": "float64",
+    "financial stress": "float64",
+    "family history of mental illness": "category",
+    "depression": "float64",
+
+    # anxiety_depression
+    "education_level": "category",
+    "employment_status": "category",
+    "sleep_hours": "float64",
+    "physical_activity_hrs": "float64",
+    "social_support_score": "float64",
+    "anxiety_score": "float64",
+    "depression_score": "float64",
+    "stress_level": "float64",
+    "family_history_mental_illness": "float64",
+    "chronic_illnesses": "float64",
+    "medication_use": "category",
+    "therapy": "float64",
+    "meditation": "float64",
+    "substance_use": "category",
+    "financial_stress": "float64",
+    "work_stress": "float64",
+    "self_esteem_score": "float64",
+    "life_satisfaction_score": "float64",
+    "loneliness_score": "float64"
+}
+
+boolean_values = {
+    "true": True,
+    "false": False
+}
+
+def coerce_column(values, dtype):
+    # Slow path for a column that failed to parse with its declared dtype
+    if dtype == "float64":
+        return pd.to_numeric(values, errors="coerce").astype("float64")
+    if dtype == "boolean":
+        return values.str.lower().map(boolean_values).astype("boolean")
+    return values.astype(dtype)
+
+def scan_lines(path):
+    """
+    Check the field count of every record against the header in one pass.
+    pandas pads short rows with missing values and, with usecols, ignores
+    extra fields, so neither would be noticed while parsing.
+    Returns (lines, bad_lines): the file line (1-based, header is line 1)
+    of every well-formed data record, and a report entry per malformed
+    record. Records spanning several lines are numbered by their first line.
+    """
+    lines, bad_lines = [], []
+    with open(path, newline="") as f:
+        width = len(next(csv.reader([f.readline()])))
+        # Without quotes a record is one line and its fields are its commas + 1
+        for number, line in enumerate(f, 2):
+            if '"' in line:
+                break
+            fields = line.count(",") + 1
+            if fields == width:
+                lines.append(number)
+            elif line.strip():
+                # Blank lines are skipped by the parser as well
+                bad_lines.append({"line": number, "column": None, "value": line.rstrip("\r\n"), "error": f"expected {width} fields, saw {fields}"})
+        else:
+            return lines, bad_lines
+
+    # Quoted fields can hold commas and line breaks, so fall back to the csv module
+    lines, bad_lines = [], []
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader)
+        last = reader.line_num
+        for row in reader:
+            start, last = last + 1, reader.line_num
+            if not row:
+                continue
+            if len(row) != width:
+                bad_lines.append({"line": start, "column": None, "value": ",".join(row), "error": f"expected {width} fields, saw {len(row)}"})
+            else:
+                lines.append(start)
+    return lines, bad_lines
+
+def read_input(path, columns=None, engine="c"):
+    """
+    Read a raw input CSV using the dtypes declared in RAW_SCHEMA.
+    Only the given schema columns (default: all of them) that exist in the
+    file are parsed. Rows with the wrong number of fields or values that do
+    not fit their column's dtype are dropped and returned as a report
+    instead of failing the whole file.
+    Returns (df, malformed) with lowercase column names. df is indexed by
+    each row's line in the file, so dropped rows leave gaps and output rows
+    can be traced back to the input.
+    """
+    wanted = set(columns) if columns is not None else set(RAW_SCHEMA)
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in header if c.lower() in wanted and c.lower() in RAW_SCHEMA]
+    dtypes = {c: RAW_SCHEMA[c.lower()] for c in usecols}
+
+    if engine == "pyarrow" and find_spec("pyarrow") is None:
+        print("pyarrow is not installed, falling back to the C parser")
+        engine = "c"
+
+    lines, bad_lines = scan_lines(path)
+    # 0-based physical lines of the malformed records, for the C parser's skiprows
+    skip = {entry["line"] - 1 for entry in bad_lines}
+
+    def read(dtype):
+        if engine == "pyarrow":
+            # The pyarrow parser only takes an integer skiprows, but rejects the same records itself
+            df = pd.read_csv(path, usecols=usecols, dtype=dtype, engine=engine, on_bad_lines=lambda row: "skip")
+        else:
+            df = pd.read_csv(path, usecols=usecols, dtype=dtype, engine=engine, skiprows=skip)
+        if len(df) != len(lines):
+            raise RuntimeError(f"Parsed {len(df)} rows from {path} but found {len(lines)} well-formed records")
+        df.index = lines
+        return df
+
+    malformed = []
+    try:
+        df = read(dtypes)
+    except (ValueError, TypeError):
+        # Some value does not fit its dtype, so parse as text and coerce column by column
+        df = read({c: "string" for c in usecols})
+        bad_rows = pd.Series(False, index=df.index)
+        for col, dtype in dtypes.items():
+            raw = df[col]
+            df[col] = coerce_column(raw, dtype)
+            failed = raw.notna() & df[col].isna()
+            for line in failed[failed].index:
+                malformed.append({"line": line, "column": col.lower(), "value": raw[line], "error": f"not a valid {dtype}"})
+            bad_rows |= failed
+        df = df[~bad_rows]
+
+    df.columns = df.columns.str.lower()
+
+    report = pd.DataFrame(bad_lines + malformed, columns=["line", "column", "value", "error"])
+    return df, report
+
+def read_text(path, skip_lines=(), chunk_size=100_000):
+    """
+    Yield every column of a raw input CSV as the original text, chunk_size
+    rows at a time, skipping the given file lines (the malformed rows
+    reported by read_input), so the rows line up with the read_input frame
+    and can be echoed next to its predictions exactly as they were written.
+    """
+    skip = {line - 1 for line in skip_lines}
+    with pd.read_csv(path, dtype=str, keep_default_na=False, skiprows=skip, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            chunk.columns = chunk.columns.str.lower()
+            yield chunk
@@ -0,0 +1,227 @@
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import os
+from scripts.ingestion import RAW_SCHEMA
+from scripts.preprocessing import ROOT_DIR, SPECS, processed_path
+
+REFERENCE_PATH = os.path.join(ROOT_DIR, "pre_processed/reference_stats.json")
+
+# Histogram bins per numeric feature; features with few distinct values get one bin per value
+HISTOGRAM_BINS = 10
+MAX_DISCRETE_VALUES = 20
+
+# Alert limits
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+KS_ALPHA_FACTOR = 1.63  # two-sample KS critical value factor at alpha = 0.01
+KS_MIN_EFFECT = 0.05  # the critical value shrinks with batch size, so large batches also need a visible shift
+MIN_DRIFT_ROWS = 200  # PSI/KS on smaller batches is mostly noise, so they are reported but not alerted
+UNKNOWN_ALERT = 0.01
+RATE_TOLERANCE = 0.05  # allowed rise in drop/missing rate over training
+UNKNOWN_SAMPLES = 5
+
+def histogram_edges(values):
+    # Interior bin edges: midpoints between the values of discrete features, quantiles otherwise
+    uniques = np.unique(values)
+    if len(uniques) <= MAX_DISCRETE_VALUES:
+        return (uniques[:-1] + uniques[1:]) / 2
+    return np.unique(np.quantile(values, np.linspace(0, 1, HISTOGRAM_BINS + 1)[1:-1]))
+
+def bin_counts(values, edges):
+    # Values outside the reference range fall into the first/last bin
+    return np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+
+def build_reference(datasets=None):
+    """
+    Reference summaries of the training data: a histogram and missing share
+    per processed feature (pre_processed/*.csv), the raw category levels
+    seen in training (raw/training/*.csv) and the share of rows
+    preprocessing dropped.
+    """
+    reference = {}
+    for dataset in datasets or SPECS:
+        spec = SPECS[dataset]
+        raw = pd.read_csv(os.path.join(ROOT_DIR, spec["raw_path"]))
+        raw.columns = raw.columns.str.lower()
+        processed = pd.read_csv(processed_path(dataset))
+
+        features = {}
+        for col in processed.columns.drop(spec["target"]):
+            values = processed[col].dropna().to_numpy(dtype=float)
+            edges = histogram_edges(values)
+            features[col] = {
+                "edges": edges.tolist(),
+                "counts": bin_counts(values, edges).tolist(),
+                "missing_rate": float(processed[col].isna().mean())
+            }
+
+        categories = {}
+        for col in spec["input_columns"]:
+            if RAW_SCHEMA.get(col) == "category":
+                levels = raw[col].dropna().astype(str)
+                if col in spec.get("onehot", {}):
+                    levels = levels.str.lower()
+                categories[col] = sorted(levels.unique())
+
+        reference[dataset] = {
+            "drop_rate": 1 - len(processed) / len(raw),
+            "features": features,
+            "categories": categories
+        }
+    return reference
+
+def save_reference(reference, path=REFERENCE_PATH):
+    with open(path, "w") as f:
+        json.dump(reference, f, indent=4)
+    print(f"Reference statistics saved to {path}")
+
+def load_reference(path=REFERENCE_PATH):
+    # Built from the training data the first time and reused afterwards
+    if not os.path.exists(path):
+        save_reference(build_reference(), path)
+    with open(path) as f:
+        return json.load(f)
+
+def psi(expected, actual):
+    # Population stability index over matching bins, empty bins smoothed
+    expected = np.clip(expected / expected.sum(), 1e-4, None)
+    actual = np.clip(actual / actual.sum(), 1e-4, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+def binned_ks(expected, actual):
+    # KS statistic between the binned CDFs, a lower bound on the exact statistic
+    return float(np.abs(np.cumsum(expected) / expected.sum() - np.cumsum(actual) / actual.sum()).max())
+
+class DriftMonitor:
+    """
+    Running statistics of scored inputs, compared against the reference
+    summaries. Each update only adds to fixed-size counters (histogram bins,
+    row/missing/unknown counts, a few unknown sample values), so memory per
+    feature stays constant however many batches are monitored, and monitors
+    of separate batches can be merged.
+    """
+
+    def __init__(self, reference):
+        self.reference = reference
+        self.rows = {}
+        self.features = {}
+        self.categories = {}
+
+    def update(self, input_df, processed_inputs):
+        # processed_inputs maps dataset -> preprocessed partition of input_df
+        for dataset, processed in processed_inputs.items():
+            reference = self.reference[dataset]
+            rows = self.rows.setdefault(dataset, {"rows": 0, "kept": 0})
+            rows["rows"] += len(input_df)
+            rows["kept"] += len(processed)
+
+            # Features missing from the reference (e.g. categorical encoding columns) are skipped
+            for col, ref in reference["features"].items():
+                if col not in processed.columns:
+                    continue
+                values = processed[col].to_numpy(dtype=float)
+                stats = self.features.setdefault((dataset, col), {"missing": 0, "counts": np.zeros(len(ref["counts"]), dtype=np.int64)})
+                missing = np.isnan(values)
+                stats["missing"] += int(missing.sum())
+                stats["counts"] += bin_counts(values[~missing], np.asarray(ref["edges"]))
+
+            onehot = SPECS[dataset].get("onehot", {})
+            functions = SPECS[dataset].get("functions", {})
+            fallbacks = SPECS[dataset].get("fallbacks", {})
+            for col, known in reference["categories"].items():
+                values = input_df[col]
+                # Only the distinct values are compared, so the cost does not grow with the rows
+                uniques = values.dropna().unique()
+                normalized = [str(u).lower() if col in onehot else str(u) for u in uniques]
+                unknown = [u for u, n in zip(uniques, normalized) if n not in known]
+                if col in functions:
+                    # Free-text columns are simplified by a function, so a new value only matters if it lands in the fallback
+                    unknown = [u for u in unknown if col in fallbacks and functions[col](str(u)) == fallbacks[col]]
+                stats = self.categories.setdefault((dataset, col), {"rows": 0, "missing": 0, "unknown": 0, "samples": []})
+                stats["rows"] += len(values)
+                stats["missing"] += int(values.isna().sum())
+                if unknown:
+                    stats["unknown"] += int(values.isin(unknown).sum())
+                    samples = stats["samples"] + [str(u) for u in unknown if str(u) not in stats["samples"]]
+                    stats["samples"] = samples[:UNKNOWN_SAMPLES]
+
+    def merge(self, other):
+        for dataset, rows in other.rows.items():
+            totals = self.rows.setdefault(dataset, {"rows": 0, "kept": 0})
+            totals["rows"] += rows["rows"]
+            totals["kept"] += rows["kept"]
+        for key, stats in other.features.items():
+            totals = self.features.setdefault(key, {"missing": 0, "counts": np.zeros_like(stats["counts"])})
+            totals["missing"] += stats["missing"]
+            totals["counts"] += stats["counts"]
+        for key, stats in other.categories.items():
+            totals = self.categories.setdefault(key, {"rows": 0, "missing": 0, "unknown": 0, "samples": []})
+            for field in ["rows", "missing", "unknown"]:
+                totals[field] += stats[field]
+            totals["samples"] = (totals["samples"] + [s for s in stats["samples"] if s not in totals["samples"]])[:UNKNOWN_SAMPLES]
+        return self
+
+    def report(self):
+        """
+        One row per monitored dataset (drop rate), processed feature
+        (missing rate, PSI and binned KS) and raw categorical column
+        (unknown-category rate), with status "ok", "warn" or "alert" and
+        the reason.
+        """
+        records = []
+        for dataset, rows in self.rows.items():
+            drop_rate = 1 - rows["kept"] / rows["rows"] if rows["rows"] else 0.0
+            reference_rate = self.reference[dataset]["drop_rate"]
+            status, reason = "ok", ""
+            if drop_rate > reference_rate + RATE_TOLERANCE:
+                status, reason = "alert", f"{drop_rate:.1%} of rows dropped by preprocessing, {reference_rate:.1%} in training"
+            records.append({"dataset": dataset, "feature": "(rows)", "kind": "rows", "rows": rows["rows"], "drop_rate": drop_rate, "reference": reference_rate, "status": status, "reason": reason})
+
+        for (dataset, col), stats in self.features.items():
+            reference = self.reference[dataset]["features"][col]
+            expected = np.asarray(reference["counts"], dtype=float)
+            actual = stats["counts"].astype(float)
+            n, m = expected.sum(), actual.sum()
+            missing_rate = stats["missing"] / (m + stats["missing"]) if m + stats["missing"] else 0.0
+            record = {"dataset": dataset, "feature": col, "kind": "numeric", "rows": int(m) + stats["missing"], "missing": stats["missing"], "status": "ok", "reason": ""}
+            if missing_rate > reference["missing_rate"] + RATE_TOLERANCE:
+                record["status"] = "alert"
+                record["reason"] = f"{missing_rate:.1%} missing or unmapped, {reference['missing_rate']:.1%} in training"
+            elif m > 0:
+                record["psi"] = psi(expected, actual)
+                record["ks"] = binned_ks(expected, actual)
+                record["ks_critical"] = KS_ALPHA_FACTOR * np.sqrt((n + m) / (n * m))
+                if m < MIN_DRIFT_ROWS:
+                    record["reason"] = f"fewer than {MIN_DRIFT_ROWS} rows, drift not assessed"
+                elif record["psi"] >= PSI_ALERT or record["ks"] > max(record["ks_critical"], KS_MIN_EFFECT):
+                    record["status"] = "alert"
+                    record["reason"] = f"distribution shift (PSI {record['psi']:.3f}, KS {record['ks']:.3f})"
+                elif record["psi"] >= PSI_WARN:
+                    record["status"] = "warn"
+                    record["reason"] = f"moderate shift (PSI {record['psi']:.3f})"
+            records.append(record)
+
+        for (dataset, col), stats in self.categories.items():
+            present = stats["rows"] - stats["missing"]
+            unknown_rate = stats["unknown"] / present if present else 0.0
+            status, reason = "ok", ""
+            if stats["unknown"]:
+                status = "alert" if unknown_rate > UNKNOWN_ALERT else "warn"
+                reason = f"{unknown_rate:.2%} unseen categories, e.g. {', '.join(stats['samples'])}"
+            records.append({"dataset": dataset, "feature": col, "kind": "category", "rows": stats["rows"], "missing": stats["missing"], "unknown_rate": unknown_rate, "status": status, "reason": reason})
+
+        columns = ["dataset", "feature", "kind", "rows", "missing", "psi", "ks", "ks_critical", "unknown_rate", "drop_rate", "reference", "status", "reason"]
+        return pd.DataFrame(records, columns=columns)
+
+def alerts(report):
+    flagged = report[report["status"] != "ok"]
+    return [f"[{row.status}] {row.dataset}/{row.feature}: {row.reason}" for row in flagged.itertuples()]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the drift monitoring reference from the training data")
+    parser.add_argument("datasets", nargs="*", default=list(SPECS), help="datasets to summarize (default: all)")
+    args = parser.parse_args()
+
+    save_reference(build_reference(args.datasets))
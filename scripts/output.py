@@ -0,0 +1,100 @@
+import pandas as pd
+import os
+from importlib.util import find_spec
+from scripts.ingestion import read_text
+
+formats = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow"
+}
+
+prediction_columns = [
+    "final_pred",
+    "final_confidence_percent"
+]
+
+def output_format(path, fmt=None):
+    if fmt is None:
+        fmt = formats.get(os.path.splitext(path)[1].lower(), "csv")
+    if fmt in ("parquet", "arrow") and find_spec("pyarrow") is None:
+        raise ImportError(f"pyarrow is required to write {fmt} output")
+    return fmt
+
+def output_chunks(predictions, input_df=None, member_probs=None, id_column="id", include_input=False,
+                  input_path=None, skip_lines=(), chunk_size=100_000):
+    """
+    Yield the output a chunk of rows at a time: the ID column (id_column if
+    the input has it, otherwise the row's line in the input file), the final prediction
+    and confidence, P(class 1) of each member if member_probs is given, and
+    every input column if include_input. With input_path the input columns
+    are streamed from the file as written, skipping skip_lines (the
+    malformed lines read_input reported), otherwise they come from
+    input_df. Columns are sliced per chunk, so the full joined frame is
+    never built.
+    """
+    columns = {}
+    text = None
+    if include_input and input_path is not None:
+        text = read_text(input_path, skip_lines, chunk_size)
+    elif include_input and input_df is not None:
+        columns.update({col: input_df[col] for col in input_df.columns})
+    elif input_df is not None and id_column in input_df.columns:
+        columns[id_column] = input_df[id_column]
+    else:
+        columns["line"] = pd.Series(predictions.index, index=predictions.index)
+
+    for col in prediction_columns:
+        columns[col] = predictions[col]
+
+    # Members only score the rows of their own partition
+    for name, probs in (member_probs or {}).items():
+        columns[f"{name}_prob"] = probs.iloc[:, -1].reindex(predictions.index)
+
+    for start in range(0, len(predictions), chunk_size):
+        chunk = pd.DataFrame({col: values.iloc[start:start + chunk_size] for col, values in columns.items()})
+        if text is not None:
+            echoed = next(text, None)
+            if echoed is None or len(echoed) != len(chunk):
+                raise RuntimeError(f"Rows read back from {input_path} do not line up with the predictions")
+            chunk = pd.concat([echoed.set_axis(chunk.index), chunk], axis=1)
+        yield chunk
+
+def write_output(path, predictions, fmt=None, float_format=None, **chunk_options):
+    # Stream output_chunks to CSV, Parquet or Arrow IPC (feather) and return the rows written
+    fmt = output_format(path, fmt)
+    rows = 0
+
+    if fmt == "csv":
+        with open(path, "w", newline="") as f:
+            for i, chunk in enumerate(output_chunks(predictions, **chunk_options)):
+                chunk.to_csv(f, header=(i == 0), index=False, float_format=float_format)
+                rows += len(chunk)
+        return rows
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in output_chunks(predictions, **chunk_options):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema) if fmt == "parquet" else pa.ipc.new_file(path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def summarize(predictions):
+    # One-line summary used instead of printing the whole table
+    scored = predictions["final_pred"].notna()
+    positives = int((predictions["final_pred"] == 1).sum())
+    return (
+        f"{len(predictions)} rows, {int(scored.sum())} scored, "
+        f"{positives} predicted depressed ({positives / max(int(scored.sum()), 1):.1%}), "
+        f"mean confidence {predictions['final_confidence_percent'].mean():.1f}%"
+    )
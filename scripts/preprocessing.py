@@ -0,0 +1,296 @@
+import pandas as pd
+import argparse
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Mappings
+who_bmi_map = {
+    "Underweight": 0,
+    "Normal": 1,
+    "Overweight": 2,
+    "Class I Obesity": 3,
+    "Class II Obesity": 4,
+    "Class III Obesity": 5
+}
+
+severity_map = {
+    "None-minimal": 0,
+    "Mild": 1,
+    "Moderate": 2,
+    "Moderately severe": 3,
+    "Severe": 4
+}
+
+true_false_map = {
+    True: 1,
+    False: 0
+}
+
+health_multiclass = {
+    "Unhealthy": 0,
+    "Moderate": 1,
+    "Healthy": 2
+}
+
+sleep_multiclass = {
+    "Less than 5 hours": 0,
+    "5-6 hours": 1,
+    "7-8 hours": 2,
+    "More than 8 hours": 3
+}
+
+yes_no_map = {
+    "Yes": 1,
+    "No": 0
+}
+
+degree_multiclass = {
+    "high school": 0,
+    "other": 0,
+    "bachelor's": 1,
+    "master's": 2,
+    "phd": 3
+}
+
+education_multiclass = {
+    "Other": 0,
+    "High School": 1,
+    "Bachelor's": 2,
+    "Master's": 3,
+    "PhD": 4
+}
+
+medication_multiclass = {
+    "Occasional": 1,
+    "Regular": 2
+}
+
+substance_multiclass = {
+    "Occasional": 1,
+    "Frequent": 2
+}
+
+def profession_simplification(x):
+    x_lower = x.lower()
+    if "student" in x_lower:
+        return "unemployed"
+    if "unemployed" in x_lower or "none" in x_lower or "other" in x_lower:
+        return "unemployed"
+    return "employed"
+
+def degree_map(x):
+    if x == "Class 12":
+        return "high school"
+    elif x.startswith("B") or x == "LLB":
+        return "bachelor's"
+    elif x.startswith("M") or x == "LLM":
+        return "master's"
+    elif x == "PhD":
+        return "phd"
+    else:
+        return "other"
+
+# Per-dataset preprocessing specs (lowercase column names), applied in this order:
+#   dropna -> drop -> exclude rows -> functions -> maps (+ defaults) -> thresholds
+#   -> rename -> one-hot/categorical -> astype (rows with missing values dropped) -> last
+SPECS = {
+    "depression_anxiety": {
+        "raw_path": "raw/training/depression_anxiety_dataset.csv",
+        "processed_path": "pre_processed/processed_depression_anxiety.csv",
+        "target": "depressiveness",
+        "input_columns": [
+            "school_year", "age", "gender", "bmi", "who_bmi", "phq_score", "gad_score",
+            "anxiety_severity", "anxiousness", "anxiety_diagnosis", "anxiety_treatment",
+            "epworth_score", "sleepiness"
+        ],
+        "dropna": True,
+        # Dropping these because of leakage
+        "drop": ["id", "depression_diagnosis", "depression_treatment", "depression_severity", "suicidal"],
+        "exclude": {"who_bmi": ["Not Availble"]},
+        "maps": {
+            "who_bmi": who_bmi_map,
+            "anxiety_severity": severity_map,
+            "depressiveness": true_false_map,
+            "sleepiness": true_false_map,
+            "anxiousness": true_false_map,
+            "anxiety_diagnosis": true_false_map,
+            "anxiety_treatment": true_false_map
+        },
+        "onehot": {"gender": ["female", "male"]},
+        "last": ["depressiveness", "sleepiness", "anxiousness", "anxiety_diagnosis", "anxiety_treatment"]
+    },
+    "student_depression": {
+        "raw_path": "raw/training/student_depression_dataset.csv",
+        "processed_path": "pre_processed/processed_student_depression.csv",
+        "target": "depression",
+        "input_columns": [
+            "gender", "age", "academic pressure", "work pressure", "cgpa", "study satisfaction",
+            "job satisfaction", "sleep duration", "dietary habits", "degree", "work/study hours",
+            "financial stress", "profession", "have you ever had suicidal thoughts ?",
+            "family history of mental illness"
+        ],
+        "drop": ["id", "city"],
+        "exclude": {"sleep duration": ["Others"]},
+        "functions": {
+            "degree": degree_map,
+            "profession": profession_simplification
+        },
+        # What a function returns for values it does not recognize, so the drift monitor can tell them apart
+        "fallbacks": {"degree": "other"},
+        "maps": {
+            "dietary habits": health_multiclass,
+            "sleep duration": sleep_multiclass,
+            "family history of mental illness": yes_no_map,
+            "have you ever had suicidal thoughts ?": yes_no_map,
+            "degree": degree_multiclass
+        },
+        "rename": {"degree": "education level"},
+        "onehot": {"profession": ["employed", "unemployed"], "gender": ["female", "male"]},
+        "last": ["have you ever had suicidal thoughts ?", "family history of mental illness"]
+    },
+    "anxiety_depression": {
+        "raw_path": "raw/training/anxiety_depression_dataset.csv",
+        "processed_path": "pre_processed/processed_anxiety_depression.csv",
+        "target": "is_depressed",
+        "input_columns": [
+            "age", "gender", "education_level", "employment_status", "sleep_hours",
+            "physical_activity_hrs", "social_support_score", "anxiety_score", "stress_level",
+            "family_history_mental_illness", "chronic_illnesses", "medication_use", "therapy",
+            "meditation", "substance_use", "financial_stress", "work_stress", "self_esteem_score",
+            "life_satisfaction_score", "loneliness_score"
+        ],
+        "maps": {
+            "medication_use": medication_multiclass,
+            "substance_use": substance_multiclass,
+            "education_level": education_multiclass
+        },
+        # No/unknown use counts as none
+        "defaults": {"medication_use": 0, "substance_use": 0},
+        "thresholds": {"depression_score": 11},
+        "rename": {"depression_score": "is_depressed"},
+        "onehot": {
+            "employment_status": ["employed", "retired", "student", "unemployed"],
+            "gender": ["female", "male", "non-binary", "other"]
+        },
+        "astype": "int"
+    }
+}
+
+def map_unique(values, func):
+    # Run a Python-level function once per distinct value instead of once per row
+    uniques = values.dropna().unique()
+    return values.map(dict(zip(uniques, map(func, uniques))))
+
+def compile_spec(spec):
+    """
+    Build the preprocessing function for one dataset spec. Everything that
+    depends only on the spec is resolved here, so each call is a single
+    pass of vectorized column operations over the frame.
+    """
+    drop = set(spec.get("drop", []))
+    exclude = spec.get("exclude", {})
+    functions = spec.get("functions", {})
+    maps = spec.get("maps", {})
+    defaults = spec.get("defaults", {})
+    thresholds = spec.get("thresholds", {})
+    rename = spec.get("rename", {})
+    onehot = {rename.get(col, col): levels for col, levels in spec.get("onehot", {}).items()}
+    astype = spec.get("astype")
+    last = spec.get("last", [])
+
+    def preprocess(df: pd.DataFrame, encoding: str = "onehot") -> pd.DataFrame:
+        df.columns = df.columns.str.lower()
+
+        # Row filters and column drops combined into a single copy of the frame
+        keep_rows = pd.Series(True, index=df.index)
+        if spec.get("dropna"):
+            keep_rows &= df.notna().all(axis=1)
+        for col, values in exclude.items():
+            keep_rows &= ~df[col].isin(values)
+        keep_cols = [col for col in df.columns if col not in drop]
+        df = df.loc[keep_rows, keep_cols].copy(deep=False)
+
+        for col, func in functions.items():
+            df[col] = map_unique(df[col], func)
+
+        # to_numeric turns mapped categorical columns (see ingestion.py) back into plain numbers
+        for col, mapping in maps.items():
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col].map(mapping))
+        for col, value in defaults.items():
+            df[col] = df[col].fillna(value)
+
+        for col, threshold in thresholds.items():
+            if col in df.columns:
+                df[col] = (df[col] >= threshold).astype(int)
+
+        df = df.rename(columns=rename)
+
+        for col, levels in onehot.items():
+            values = pd.Categorical(map_unique(df.pop(col), str.lower), categories=levels)
+            if encoding == "categorical":
+                # category codes appended where the one-hot columns would go, no dense expansion
+                df[col] = values
+            else:
+                # Fixed levels, so every level gets a column even if the batch lacks it
+                for code, level in enumerate(levels):
+                    df[f"{col}_{level}"] = (values.codes == code).astype(float)
+
+        if astype is not None:
+            numeric = [col for col in df.columns if not isinstance(df[col].dtype, pd.CategoricalDtype)]
+            # Missing values cannot be cast, so those rows are dropped instead of failing the whole batch
+            df = df[df[numeric].notna().all(axis=1)]
+            df = df.astype({col: astype for col in numeric})
+
+        last_cols = [col for col in last if col in df.columns]
+        other_cols = [col for col in df.columns if col not in last_cols]
+        return df[other_cols + last_cols]
+
+    return preprocess
+
+preprocessors = {name: compile_spec(spec) for name, spec in SPECS.items()}
+
+def preprocess(dataset: str, df: pd.DataFrame, encoding: str = "onehot") -> pd.DataFrame:
+    return preprocessors[dataset](df, encoding)
+
+def processed_path(dataset, encoding="onehot"):
+    path = SPECS[dataset]["processed_path"]
+    if encoding == "categorical":
+        path = path.replace(".csv", "_categorical.csv")
+    return os.path.join(ROOT_DIR, path)
+
+def load_processed(dataset, encoding="onehot", codes=False):
+    """
+    Features and target of a processed dataset as (X, y). The categorical
+    encoding is read with the fixed onehot levels of the spec, the same
+    categories preprocess builds at scoring time, and with codes the
+    categories are replaced by their integer codes for models without
+    categorical support.
+    """
+    spec = SPECS[dataset]
+    rename = spec.get("rename", {})
+    dtypes = {}
+    if encoding == "categorical":
+        dtypes = {rename.get(col, col): pd.CategoricalDtype(levels) for col, levels in spec.get("onehot", {}).items()}
+    df = pd.read_csv(processed_path(dataset, encoding), dtype=dtypes or None)
+    if codes:
+        df = df.assign(**{col: df[col].cat.codes for col in dtypes})
+    return df.drop(columns=spec["target"]), df[spec["target"]]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preprocess the raw training datasets")
+    parser.add_argument("datasets", nargs="*", default=list(SPECS), help="datasets to process (default: all)")
+    parser.add_argument("--encoding", choices=["onehot", "categorical"], default="onehot")
+    args = parser.parse_args()
+
+    for dataset in args.datasets:
+        raw_path = os.path.join(ROOT_DIR, SPECS[dataset]["raw_path"])
+        path = processed_path(dataset, args.encoding)
+
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+        df_processed = preprocess(dataset, pd.read_csv(raw_path), args.encoding)
+        df_processed.to_csv(path, index=False)
+        print(f"Write successful to {path}")
@@ -0,0 +1,124 @@
+# tune_threshold.py
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+from main import FEATURE_ENCODING, MODEL_DATASETS, MODEL_WEIGHTS, OPERATING_POINT_PATH
+from evaluate import CACHE_DIR, OUTPUT_DIR, cross_validate, ensemble_probabilities
+
+
+def threshold_curve(y_true, scores):
+    """
+    Confusion counts and metrics at every distinct score cut point.
+    Scores are sorted once and true/false positives accumulated in a single
+    pass, so the whole curve is O(n log n) instead of one report per cut.
+    Row i predicts positive for every score >= threshold[i].
+    """
+    y_true = np.asarray(y_true, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.float64)
+
+    order = np.argsort(scores, kind="mergesort")[::-1]
+    scores = scores[order]
+    y_true = y_true[order]
+
+    # Cumulative positives/negatives above each cut, keeping only the last row of tied scores
+    tp = np.cumsum(y_true)
+    fp = np.cumsum(1 - y_true)
+    last = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    tp, fp, thresholds = tp[last], fp[last], scores[last]
+
+    positives = tp[-1]
+    negatives = fp[-1]
+    fn = positives - tp
+    tn = negatives - fp
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        sensitivity = np.where(positives > 0, tp / positives, 0.0)
+        specificity = np.where(negatives > 0, tn / negatives, 0.0)
+        f1 = np.where(tp + fp + positives > 0, 2 * tp / (tp + fp + positives), 0.0)
+
+    return pd.DataFrame({
+        "threshold": thresholds,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn,
+        "precision": precision,
+        "sensitivity": sensitivity,
+        "specificity": specificity,
+        "f1": f1
+    })
+
+def choose_operating_point(curve, target_sensitivity=None):
+    # Highest threshold that reaches the target sensitivity, otherwise best F1
+    if target_sensitivity is None:
+        return curve.loc[curve["f1"].idxmax()]
+
+    reached = curve[curve["sensitivity"] >= target_sensitivity]
+    if reached.empty:
+        raise ValueError(f"No threshold reaches sensitivity {target_sensitivity}")
+    return reached.iloc[0]
+
+def save_operating_point(point, path=OPERATING_POINT_PATH, **details):
+    operating_point = {
+        "threshold": float(point["threshold"]),
+        "precision": float(point["precision"]),
+        "sensitivity": float(point["sensitivity"]),
+        "specificity": float(point["specificity"]),
+        "f1": float(point["f1"]),
+        **details
+    }
+    with open(path, "w") as f:
+        json.dump(operating_point, f, indent=4)
+    print(f"Operating point saved to {path}")
+    return operating_point
+
+def main():
+    parser = argparse.ArgumentParser(description="Choose the ensemble decision threshold from out-of-fold scores")
+    parser.add_argument("--target-sensitivity", type=float, default=None, help="minimum sensitivity (recall) to reach; best F1 if omitted")
+    parser.add_argument("--dataset", default=None, help="only use held-out scores from this dataset")
+    parser.add_argument("--folds", type=int, default=5, help="number of stratified folds")
+    parser.add_argument("--seed", type=int, default=42, help="fold shuffling seed")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel fold fits (-1 = all cores)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="on-disk cache for fold splits and predictions")
+    parser.add_argument("--encoding", choices=["onehot", "categorical"], default=FEATURE_ENCODING, help="feature encoding the operating point is tuned and used for")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="where the threshold curve is written")
+    parser.add_argument("--dry-run", action="store_true", help="print the operating point without saving it")
+    args = parser.parse_args()
+
+    data, oof = cross_validate(args.folds, args.seed, args.jobs, args.cache_dir, args.encoding)
+    ensemble = ensemble_probabilities(data, oof)
+
+    # Only the datasets behind the scoring ensemble in main.py. The scores are the per-dataset
+    # ensembles pooled over these datasets (so the larger dataset dominates), not the
+    # cross-dataset blend main.py applies the threshold to on inputs with every partition
+    datasets = [args.dataset] if args.dataset else list(dict.fromkeys(MODEL_DATASETS.values()))
+    y_true = np.concatenate([data[name][1] for name in datasets])
+    scores = np.concatenate([ensemble[name] for name in datasets])
+
+    curve = threshold_curve(y_true, scores)
+    point = choose_operating_point(curve, args.target_sensitivity)
+
+    if not os.path.exists(args.output_dir):
+        os.makedirs(args.output_dir)
+    curve.to_csv(os.path.join(args.output_dir, "threshold_curve.csv"), index=False)
+
+    print("Chosen operating point:")
+    print(point.to_string())
+
+    if not args.dry_run:
+        save_operating_point(
+            point,
+            target_sensitivity=args.target_sensitivity,
+            datasets=datasets,
+            folds=args.folds,
+            seed=args.seed,
+            model_weights=MODEL_WEIGHTS,
+            encoding=args.encoding,
+            scope="per-dataset ensembles"
+        )
+
+if __name__ == "__main__":
+    main()